@@ -2,19 +2,25 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import hashlib
+import heapq
+import itertools
 import json
 import logging
 import os
+import sys
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timedelta, timezone, tzinfo
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError, available_timezones
 
 import discord
 import json5
-import pytz
 import requests
 from discord import ButtonStyle, app_commands
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 try:
     from discord.abc import MessageableChannel
@@ -25,12 +31,81 @@ from discord.ext import commands
 from discord.ui import Button, Modal, TextInput, View
 from dotenv import load_dotenv
 
+try:
+    import uvloop
+except ImportError:  # optional speedup; uvloop does not support Windows
+    uvloop = None  # type: ignore[assignment]
+
 logging.basicConfig(level=logging.INFO)
 
+# load_config shadows ``timezone`` with the configured zone, so keep a name for the stdlib UTC.
+UTC = timezone.utc
+
 ANNOUNCEMENT_TITLE = "VIP Control Center"
+# Discord returns up to 100 messages per history page, so this stays one request.
+ANNOUNCEMENT_HISTORY_SCAN_LIMIT = 50
+COMMAND_SYNC_POLICIES = ("safe", "bulk", "off")
+ERROR_BODY_EXCERPT_BYTES = 512
 PLAYER_ID_PLACEHOLDER = (
     "Go to https://hllrecords.com/, get your player_id (e.g. 2805d5bbe14b6ec432f82e5cb859d012)."
 )
+ASSIGNVIP_ROLE_REASON = "Frontline Pass: temporary VIP role for claim"
+
+
+class EphemeralCleanupScheduler:
+    """Deletes ephemeral responses from a single background task instead of one sleeper per call."""
+
+    def __init__(self) -> None:
+        self._queue: List[Tuple[float, int, discord.Interaction, Optional[discord.Message]]] = []
+        self._sequence = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def enqueue(
+        self,
+        interaction: discord.Interaction,
+        message: Optional[discord.Message],
+        delay: float,
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        heapq.heappush(self._queue, (loop.time() + delay, next(self._sequence), interaction, message))
+        if self._task is None or self._task.done() or self._wakeup is None:
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._run(self._wakeup))
+        else:
+            self._wakeup.set()
+
+    async def _run(self, wakeup: asyncio.Event) -> None:
+        loop = asyncio.get_running_loop()
+        while self._queue:
+            now = loop.time()
+            deadline = self._queue[0][0]
+            if deadline > now:
+                wakeup.clear()
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(wakeup.wait(), timeout=deadline - now)
+                continue
+            due: List[Tuple[discord.Interaction, Optional[discord.Message]]] = []
+            while self._queue and self._queue[0][0] <= now:
+                _, _, interaction, message = heapq.heappop(self._queue)
+                due.append((interaction, message))
+            await asyncio.gather(*(self._delete(interaction, message) for interaction, message in due))
+
+    @staticmethod
+    async def _delete(interaction: discord.Interaction, message: Optional[discord.Message]) -> None:
+        # One failed delete must not end the shared task and strand the rest of the queue.
+        try:
+            if message is None:
+                await interaction.delete_original_response()
+            else:
+                await message.delete()
+        except discord.HTTPException:
+            pass
+        except Exception:
+            logging.exception("Failed to delete ephemeral response")
+
+
+_ephemeral_cleanup = EphemeralCleanupScheduler()
 
 
 def schedule_ephemeral_cleanup(
@@ -39,15 +114,7 @@ def schedule_ephemeral_cleanup(
     delay: float = 10.0,
     message: Optional[discord.Message] = None,
 ) -> None:
-    async def _cleanup() -> None:
-        await asyncio.sleep(delay)
-        with contextlib.suppress(discord.HTTPException, discord.NotFound):
-            if message is None:
-                await interaction.delete_original_response()
-            else:
-                await message.delete()
-
-    asyncio.create_task(_cleanup())
+    _ephemeral_cleanup.enqueue(interaction, message, delay)
 
 
 def build_announcement_embed(
@@ -75,6 +142,11 @@ class AnnouncementManager:
     def __init__(self, config: AppConfig) -> None:
         self._config = config
         self._message_id: Optional[int] = None
+        self._message: Optional[discord.Message] = None
+        self._rendered_duration: Optional[float] = None
+
+    def is_current(self, vip_duration_hours: float) -> bool:
+        return self._message_id is not None and self._rendered_duration == vip_duration_hours
 
     async def ensure(
         self,
@@ -84,26 +156,38 @@ class AnnouncementManager:
         last_grant_at: Optional[datetime],
         *,
         force_new: bool = False,
+        verify: bool = False,
     ) -> Optional[discord.Message]:
+        if not (force_new or verify) and self._message is not None and self.is_current(vip_duration_hours):
+            # The embed only renders the duration and timezone, so an unchanged
+            # duration means the posted message is already correct. Callers that
+            # need to know the message still exists pass verify=True.
+            return self._message
+
         destination = await self._resolve_destination(bot)
         if destination is None:
             return None
 
+        embed = build_announcement_embed(self._config, vip_duration_hours, last_grant_at)
         if force_new:
             await self._delete_existing(destination, bot)
-            message = None
         else:
-            message = await self._locate_message(destination, bot)
-
-        embed = build_announcement_embed(self._config, vip_duration_hours, last_grant_at)
-        if message:
-            await message.edit(embed=embed, view=view)
-            self._message_id = message.id
-            logging.info("Reattached control view to existing message %s", message.id)
-            return message
+            message = await self._edit_known_message(destination, embed, view)
+            if message is None:
+                message = await self._locate_message(destination, bot)
+                if message:
+                    await message.edit(embed=embed, view=view)
+            if message:
+                self._message_id = message.id
+                self._message = message
+                self._rendered_duration = vip_duration_hours
+                logging.info("Reattached control view to existing message %s", message.id)
+                return message
 
         sent_message = await destination.send(embed=embed, view=view)
         self._message_id = sent_message.id
+        self._message = sent_message
+        self._rendered_duration = vip_duration_hours
         logging.info(
             "Posted announcement message with id %s. Set for future updates within this session.",
             sent_message.id,
@@ -125,44 +209,61 @@ class AnnouncementManager:
 
         return destination
 
-    async def _locate_message(
+    async def _edit_known_message(
         self,
         destination: MessageableChannel,
-        bot: commands.Bot,
+        embed: discord.Embed,
+        view: View,
     ) -> Optional[discord.Message]:
+        # Editing a partial message skips the fetch round trip; a NotFound just
+        # means the id is stale and the next candidate should be tried.
         for message_id in self._candidate_message_ids():
             try:
-                message = await destination.fetch_message(message_id)
-                return message
+                return await destination.get_partial_message(message_id).edit(embed=embed, view=view)
             except discord.NotFound:
                 continue
             except discord.DiscordException:
-                logging.exception("Failed to fetch announcement message %s", message_id)
+                logging.exception("Failed to edit announcement message %s", message_id)
+        return None
 
-        async for message in destination.history(limit=50):
-            if message.author == bot.user and message.embeds:
-                if message.embeds[0].title == ANNOUNCEMENT_TITLE:
-                    self._message_id = message.id
-                    return message
+    async def _locate_message(
+        self,
+        destination: MessageableChannel,
+        bot: commands.Bot,
+    ) -> Optional[discord.Message]:
+        async for message in destination.history(limit=ANNOUNCEMENT_HISTORY_SCAN_LIMIT):
+            if self._is_announcement(message, bot):
+                self._message_id = message.id
+                if not self._config.announcement_message_id:
+                    logging.info(
+                        "Found announcement message %s by scanning channel history; set "
+                        "ANNOUNCEMENT_MESSAGE_ID=%s to skip the scan on future restarts.",
+                        message.id,
+                        message.id,
+                    )
+                return message
         return None
 
     async def _delete_existing(self, destination: MessageableChannel, bot: commands.Bot) -> None:
         for message_id in self._candidate_message_ids():
             try:
-                message = await destination.fetch_message(message_id)
+                await destination.get_partial_message(message_id).delete()
             except discord.NotFound:
                 continue
             except discord.DiscordException:
-                logging.exception("Failed to fetch announcement message %s for deletion", message_id)
-                continue
-            await self._delete_message(message)
+                logging.exception("Failed to delete announcement message %s", message_id)
 
-        async for message in destination.history(limit=50):
-            if message.author == bot.user and message.embeds:
-                if message.embeds[0].title == ANNOUNCEMENT_TITLE:
-                    await self._delete_message(message)
+        async for message in destination.history(limit=ANNOUNCEMENT_HISTORY_SCAN_LIMIT):
+            if self._is_announcement(message, bot):
+                await self._delete_message(message)
 
         self._message_id = None
+        self._message = None
+        self._rendered_duration = None
+
+    @staticmethod
+    def _is_announcement(message: discord.Message, bot: commands.Bot) -> bool:
+        return message.author == bot.user and bool(message.embeds) and message.embeds[0].title == ANNOUNCEMENT_TITLE
 
     async def _delete_message(self, message: discord.Message) -> None:
         try:
@@ -193,6 +294,22 @@ def _parse_bool_env(name: str, raw: Optional[str], errors: List[str]) -> Optiona
     return None
 
 
+def _resolve_timezone(name: str) -> Optional[ZoneInfo]:
+    try:
+        return ZoneInfo(name)
+    except ValueError:
+        return None
+    except ZoneInfoNotFoundError:
+        pass
+    # pytz matched names case-insensitively; keep accepting "utc" or
+    # "australia/sydney" from existing configs.
+    lowered = name.lower()
+    for key in available_timezones():
+        if key.lower() == lowered:
+            return ZoneInfo(key)
+    return None
+
+
 def _load_raw_config() -> Tuple[Dict[str, Any], Optional[Path]]:
     candidate_paths: List[Path] = []
     env_path = os.getenv("FRONTLINE_CONFIG_PATH") or os.getenv("CRCON_CONFIG_PATH")
@@ -236,7 +353,7 @@ class AppConfig:
     discord_token: str
     vip_duration_hours: float
     channel_id: int
-    timezone: pytz.BaseTzInfo
+    timezone: tzinfo
     timezone_name: str
     announcement_message_id: Optional[int] = None
     http_credentials: Optional[HttpCredentials] = None
@@ -244,6 +361,8 @@ class AppConfig:
     vip_temp_role_id: Optional[int] = None
     vip_claim_channel_id: Optional[int] = None
     vip_assign_limit: int = 5
+    command_sync_policy: str = "safe"
+    command_guild_ids: Tuple[int, ...] = ()
 
     @property
     def vip_duration_label(self) -> str:
@@ -258,7 +377,7 @@ class VipAssignUsageResult:
 
 
 class VipAssignLimiter:
-    def __init__(self, timezone: pytz.BaseTzInfo, *, default_limit: int, storage_path: Path) -> None:
+    def __init__(self, timezone: tzinfo, *, default_limit: int, storage_path: Path) -> None:
         self._timezone = timezone
         self._storage_path = storage_path
         self._lock = asyncio.Lock()
@@ -277,14 +396,14 @@ class VipAssignLimiter:
         normalized = max(int(new_limit), 1)
         async with self._lock:
             self._state["limit"] = normalized
-            self._save_state()
+            await self._save_state()
             return normalized
 
     async def try_consume(self, user_id: int) -> VipAssignUsageResult:
         async with self._lock:
             now = datetime.now(timezone.utc)
             if self._ensure_current_window(now):
-                self._save_state()
+                await self._save_state()
             limit = max(int(self._state.get("limit", 1)), 1)
             usage_map = self._state.setdefault("usage", {})
             key = str(user_id)
@@ -292,14 +411,14 @@ class VipAssignLimiter:
             if current >= limit:
                 return VipAssignUsageResult(False, current, limit)
             usage_map[key] = current + 1
-            self._save_state()
+            await self._save_state()
             return VipAssignUsageResult(True, current + 1, limit)
 
     async def get_usage(self, user_id: int) -> Tuple[int, int]:
         async with self._lock:
             now = datetime.now(timezone.utc)
             if self._ensure_current_window(now):
-                self._save_state()
+                await self._save_state()
             limit = max(int(self._state.get("limit", 1)), 1)
             current = int(self._state.get("usage", {}).get(str(user_id), 0))
             return current, limit
@@ -335,11 +454,16 @@ class VipAssignLimiter:
             "window_start": window_start,
         }
 
-    def _save_state(self) -> None:
+    async def _save_state(self) -> None:
+        # Callers hold self._lock, so writes still land in order.
+        payload = json.dumps(self._state)
+        await asyncio.to_thread(self._write_state, payload)
+
+    def _write_state(self, payload: str) -> None:
         try:
             self._storage_path.parent.mkdir(parents=True, exist_ok=True)
             with self._storage_path.open("w", encoding="utf-8") as handle:
-                json.dump(self._state, handle)
+                handle.write(payload)
         except Exception:
             logging.exception("Failed to persist VIP assign limiter state to %s", self._storage_path)
 
@@ -375,6 +499,8 @@ class VipAssignLimiter:
 
 def load_config() -> AppConfig:
     load_dotenv()
+    # One snapshot after .env is applied; os.environ re-encodes keys on every lookup.
+    environ = dict(os.environ)
     raw_config, _ = _load_raw_config()
     config_values = {str(key).upper(): value for key, value in raw_config.items()}
     errors: List[str] = []
@@ -399,7 +525,7 @@ def load_config() -> AppConfig:
         return None
 
     def get_value(name: str, default: Any = None) -> Any:
-        env_value = os.getenv(name)
+        env_value = environ.get(name)
         if env_value is not None and env_value.strip() != "":
             return env_value.strip()
         lookup = config_lookup(name)
@@ -475,11 +601,13 @@ def load_config() -> AppConfig:
     if vip_duration_hours is not None and vip_duration_hours <= 0:
         errors.append("VIP_DURATION_HOURS must be greater than zero")
 
-    try:
-        timezone = pytz.timezone(timezone_name)
-    except pytz.UnknownTimeZoneError:
+    resolved_timezone = _resolve_timezone(timezone_name)
+    if resolved_timezone is None:
         errors.append(f"LOCAL_TIMEZONE must be a valid IANA timezone (got {timezone_name!r})")
-        timezone = pytz.UTC
+        timezone: tzinfo = UTC
+    else:
+        timezone = resolved_timezone
+        timezone_name = resolved_timezone.key
 
     announcement_message_id = optional_int("ANNOUNCEMENT_MESSAGE_ID")
     moderator_role_id = optional_int("MODERATOR_ROLE_ID")
@@ -493,6 +621,24 @@ def load_config() -> AppConfig:
     if vip_assign_limit <= 0:
         errors.append("VIP_ASSIGN_LIMIT must be greater than zero")
 
+    command_sync_policy = str(get_value("DISCORD_COMMAND_SYNC_POLICY", "safe")).strip().lower()
+    if command_sync_policy not in COMMAND_SYNC_POLICIES:
+        errors.append(
+            f"DISCORD_COMMAND_SYNC_POLICY must be one of {', '.join(COMMAND_SYNC_POLICIES)} (got {command_sync_policy!r})"
+        )
+        command_sync_policy = "safe"
+    if optional_bool("FORCE_SYNC_ON_BOOT", default=False):
+        command_sync_policy = "bulk"
+
+    guild_ids_raw = get_value("COMMAND_GUILD_IDS") or get_value("COMMAND_GUILD_ID")
+    command_guild_ids: Tuple[int, ...] = ()
+    if guild_ids_raw:
+        parts = guild_ids_raw if isinstance(guild_ids_raw, list) else str(guild_ids_raw).split(",")
+        try:
+            command_guild_ids = tuple(int(str(part).strip()) for part in parts if str(part).strip())
+        except ValueError:
+            logging.warning("Invalid COMMAND_GUILD_IDS value %r; falling back to global sync.", guild_ids_raw)
+
     http_base_url_raw = get_value("CRCON_HTTP_BASE_URL")
     http_bearer_token = get_value("CRCON_HTTP_BEARER_TOKEN")
     http_username = get_value("CRCON_HTTP_USERNAME")
@@ -552,6 +698,8 @@ def load_config() -> AppConfig:
         vip_temp_role_id=vip_temp_role_id,
         vip_claim_channel_id=vip_claim_channel_id,
         vip_assign_limit=vip_assign_limit,
+        command_sync_policy=command_sync_policy,
+        command_guild_ids=command_guild_ids,
     )
 
 
@@ -560,6 +708,12 @@ class VipHTTPError(Exception):
 
 
 class VipHttpClient:
+    _BASE_HEADERS: Dict[str, str] = {
+        "Accept": "application/json",
+        "Content-Type": "application/json",
+        "Connection": "keep-alive",
+    }
+
     def __init__(
         self,
         credentials: HttpCredentials,
@@ -572,34 +726,62 @@ class VipHttpClient:
         if timeout is None:
             timeout = 10.0
         self.timeout = timeout
-        self.session = session or requests.Session()
+        if session is None:
+            session = requests.Session()
+            # Gateway errors from a restarting CRCON are retried on the pooled socket;
+            # read timeouts and Retry-After waits are not, so a slow server or a
+            # maintenance page cannot stretch a grant past its interaction.
+            retries = Retry(
+                total=2,
+                read=False,
+                backoff_factor=0.25,
+                respect_retry_after_header=False,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=frozenset({"GET", "POST"}),
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retries)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
         self.session.verify = credentials.verify
         self._token: Optional[str] = None
         self._authenticated = False
         self._bearer_failed = False
-
-    def _endpoint(self, name: str) -> str:
-        base = self.credentials.base_url.rstrip("/")
+        self._auth_ready = bool(credentials.bearer_token)
+        base = credentials.base_url.rstrip("/")
         if not base.lower().endswith("/api"):
             base = f"{base}/api"
-        return f"{base}/{name.lstrip('/')}"
+        self._api_base = base
+        self._endpoint_cache: Dict[str, str] = {}
+        self._auth_headers_cache: Optional[Tuple[str, Dict[str, str]]] = None
+
+    def _endpoint(self, name: str) -> str:
+        url = self._endpoint_cache.get(name)
+        if url is None:
+            url = f"{self._api_base}/{name.lstrip('/')}"
+            self._endpoint_cache[name] = url
+        return url
 
     def _headers(self, *, include_auth: bool = True) -> Dict[str, str]:
-        headers: Dict[str, str] = {
-            "Accept": "application/json",
-            "Content-Type": "application/json",
-            "Connection": "keep-alive",
-        }
-        token: Optional[str] = None
-        if include_auth:
-            token = self._authorization_token()
-            if token:
-                headers["Authorization"] = f"Bearer {token}"
-        if include_auth and not token:
-            headers["Referer"] = self.credentials.base_url
-            csrf_token = self.session.cookies.get("csrftoken")
-            if csrf_token:
-                headers["X-CSRFToken"] = csrf_token
+        if not include_auth:
+            return dict(self._BASE_HEADERS)
+        token = self._authorization_token()
+        if token:
+            # requests merges these into a fresh dict per request, so the cached
+            # mapping can be shared until the token changes.
+            cached = self._auth_headers_cache
+            if cached is None or cached[0] != token:
+                cached = (token, {**self._BASE_HEADERS, "Authorization": f"Bearer {token}"})
+                self._auth_headers_cache = cached
+            return cached[1]
+        headers = dict(self._BASE_HEADERS)
+        headers["Referer"] = self.credentials.base_url
+        # Read per request: Django may rotate csrftoken, and a stale value fails
+        # with 403, which the 401 re-login path would never recover from.
+        csrf_token = self.session.cookies.get("csrftoken")
+        if csrf_token:
+            headers["X-CSRFToken"] = csrf_token
         return headers
 
     def _authorization_token(self) -> Optional[str]:
@@ -633,7 +815,9 @@ class VipHttpClient:
             timeout=self.timeout,
         )
         if response.status_code != 200:
-            raise VipHTTPError(f"Login failed with status {response.status_code}: {response.text}")
+            raise VipHTTPError(
+                f"Login failed with status {response.status_code}: {self._response_excerpt(response)}"
+            )
 
         data = self._parse_json(response)
         if data.get("failed"):
@@ -645,12 +829,14 @@ class VipHttpClient:
         if not has_session_cookie and not token:
             raise VipHTTPError("Login succeeded but no session cookie or auth token was provided.")
         self._authenticated = True
+        self._auth_ready = True
 
     def _refresh_token_if_possible(self) -> bool:
         if not self._has_login_credentials():
             return False
         self._token = None
         self._authenticated = False
+        self._auth_ready = False
         try:
             self._login()
         except VipHTTPError:
@@ -666,10 +852,10 @@ class VipHttpClient:
         query_params: Optional[Dict[str, Any]] = None,
     ) -> requests.Response:
         url = self._endpoint(endpoint)
-        self._ensure_authenticated()
-        headers = self._headers()
+        if not self._auth_ready:
+            self._ensure_authenticated()
         request_kwargs: Dict[str, Any] = {
-            "headers": headers,
+            "headers": self._headers(),
             "timeout": self.timeout,
         }
         if json_payload is not None:
@@ -680,22 +866,16 @@ class VipHttpClient:
         if response.status_code == 401:
             if self.credentials.bearer_token:
                 self._bearer_failed = True
+                self._auth_ready = False
             logging.warning(
                 "HTTP %s %s returned 401: %s",
                 method,
                 endpoint,
-                response.text,
+                self._response_excerpt(response),
             )
             if self._refresh_token_if_possible():
-                headers = self._headers()
-                request_kwargs = {
-                    "headers": headers,
-                    "timeout": self.timeout,
-                }
-                if json_payload is not None:
-                    request_kwargs["json"] = json_payload
-                if query_params is not None:
-                    request_kwargs["params"] = query_params
+                # Only the credentials change between attempts.
+                request_kwargs["headers"] = self._headers()
                 response = self.session.request(method, url, **request_kwargs)
         return response
 
@@ -741,7 +921,9 @@ class VipHttpClient:
             raise VipHTTPError(f"HTTP API request failed: {exc}") from exc
 
         if response.status_code != 200:
-            raise VipHTTPError(f"add_vip failed with status {response.status_code}: {response.text}")
+            raise VipHTTPError(
+                f"add_vip failed with status {response.status_code}: {self._response_excerpt(response)}"
+            )
 
         data = self._parse_json(response)
         if data.get("failed"):
@@ -769,7 +951,7 @@ class VipHttpClient:
 
         if response.status_code != 200:
             raise VipHTTPError(
-                f"get_player_profile failed with status {response.status_code}: {response.text}"
+                f"get_player_profile failed with status {response.status_code}: {self._response_excerpt(response)}"
             )
 
         data = self._parse_json(response)
@@ -780,12 +962,20 @@ class VipHttpClient:
             raise VipHTTPError("get_player_profile returned an unexpected result format.")
         return result
 
+    @staticmethod
+    def _response_excerpt(response: requests.Response) -> str:
+        # Error bodies only feed logs and exception messages; an HTML error page
+        # from a proxy should not be decoded in full.
+        return response.content[:ERROR_BODY_EXCERPT_BYTES].decode("utf-8", "replace")
+
     @staticmethod
     def _parse_json(response: requests.Response) -> Dict[str, Any]:
         try:
             data = response.json()
         except ValueError as exc:
-            raise VipHTTPError(f"Failed to parse JSON response: {response.text}") from exc
+            raise VipHTTPError(
+                f"Failed to parse JSON response: {VipHttpClient._response_excerpt(response)}"
+            ) from exc
         if isinstance(data, dict):
             return data
         raise VipHTTPError("Unexpected response format; expected JSON object.")
@@ -817,7 +1007,7 @@ class VipService:
         self,
         player_id: str,
         duration_hours: float,
-        local_timezone: pytz.BaseTzInfo,
+        local_timezone: tzinfo,
         requester_display_name: str,
         *,
         player_name: Optional[str] = None,
@@ -1025,7 +1215,6 @@ class CombinedView(PersistentView):
             "; ".join(result.status_lines),
         )
         self.bot.record_vip_grant(datetime.now(timezone.utc))
-        await self.bot.refresh_announcement_message()
 
         header_lines = [
             f"You now have VIP for {self.config.vip_duration_label} hours!",
@@ -1066,6 +1255,58 @@ class CombinedView(PersistentView):
                 logging.exception("Failed to remove temporary VIP role %s from %s", role_id, user.id)
 
 
+def _canonical_option_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    canonical: Dict[str, Any] = {
+        "name": payload.get("name"),
+        "type": payload.get("type"),
+        "description": payload.get("description") or "",
+        "required": bool(payload.get("required", False)),
+        "autocomplete": bool(payload.get("autocomplete", False)),
+        "choices": [
+            {"name": choice.get("name"), "value": choice.get("value")} for choice in payload.get("choices") or []
+        ],
+        "channel_types": sorted(payload.get("channel_types") or []),
+        "options": [_canonical_option_payload(option) for option in payload.get("options") or []],
+    }
+    for key in ("min_value", "max_value", "min_length", "max_length"):
+        if payload.get(key) is not None:
+            canonical[key] = payload[key]
+    return canonical
+
+
+def _canonical_command_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    # Local Command.to_dict() and the raw API payload differ in extra keys (ids,
+    # versions, localizations) and in how defaults are spelled: permissions come
+    # back as strings, dm_permission may be null, and integration_types defaults
+    # to guild installs. Normalise both sides to what Discord actually applies.
+    permissions = payload.get("default_member_permissions")
+    dm_permission = payload.get("dm_permission")
+    return {
+        "name": payload.get("name"),
+        "type": payload.get("type", 1),
+        "description": payload.get("description") or "",
+        "options": [_canonical_option_payload(option) for option in payload.get("options") or []],
+        "default_member_permissions": None if permissions is None else str(permissions),
+        "dm_permission": True if dm_permission is None else bool(dm_permission),
+        "nsfw": bool(payload.get("nsfw", False)),
+        "contexts": sorted(payload.get("contexts") or []) or None,
+        "integration_types": sorted(payload.get("integration_types") or [0]),
+    }
+
+
+def command_tree_fingerprint(payloads: List[Dict[str, Any]]) -> str:
+    canonical = sorted(
+        (_canonical_command_payload(payload) for payload in payloads),
+        key=lambda entry: (entry["type"], entry["name"] or ""),
+    )
+    encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def format_vip_duration_message(hours: float) -> str:
+    return f"Current VIP duration: {hours:g} hours."
+
+
 class FrontlinePassBot(commands.Bot):
     def __init__(self, config: AppConfig, vip_service: VipService) -> None:
         intents = discord.Intents.default()
@@ -1075,7 +1316,12 @@ class FrontlinePassBot(commands.Bot):
         self.announcement_manager = AnnouncementManager(config)
         self.persistent_view: Optional[CombinedView] = None
         self._vip_duration_hours = config.vip_duration_hours
+        self._vip_duration_message = format_vip_duration_message(config.vip_duration_hours)
+        self._moderator_role_ids = frozenset(filter(None, [config.moderator_role_id]))
         self._last_grant_utc: Optional[datetime] = None
+        self._registered_command_names: Tuple[str, ...] = ()
+        claim_channel_id = config.vip_claim_channel_id or config.channel_id
+        self._claim_channel_mention = f"<#{claim_channel_id}>" if claim_channel_id else "the VIP channel"
         limiter_state_path = Path(__file__).resolve().with_name("vip_assign_usage.json")
         self.vip_assign_limiter = VipAssignLimiter(
             config.timezone,
@@ -1098,39 +1344,77 @@ class FrontlinePassBot(commands.Bot):
         self.persistent_view = CombinedView(self, self.config, self.vip_service)
         self.add_view(self.persistent_view)
         await self._register_commands()
-        guild_ids_raw = os.getenv("COMMAND_GUILD_IDS") or os.getenv("COMMAND_GUILD_ID")
-        synced_any_guild = False
-        if guild_ids_raw:
+        self._registered_command_names = tuple(sorted(cmd.name for cmd in self.tree.get_commands()))
+        logging.info("Registered slash commands: %s", ", ".join(self._registered_command_names))
+        policy = self.config.command_sync_policy
+        if policy == "off":
+            logging.info("Skipping slash command sync on startup; run /sync_commands to push changes.")
+        else:
             try:
-                guild_ids = [int(x.strip()) for x in guild_ids_raw.split(",") if x.strip()]
-            except ValueError:
-                logging.warning("Invalid COMMAND_GUILD_IDS value %r; falling back to global sync.", guild_ids_raw)
-                guild_ids = []
-            for gid in guild_ids:
-                try:
-                    guild_obj = discord.Object(id=gid)
-                    self.tree.copy_global_to(guild=guild_obj)
-                    await self.tree.sync(guild=guild_obj)
-                    synced_any_guild = True
-                    logging.info("Slash commands synced to guild %s", gid)
-                except discord.DiscordException:
-                    logging.exception("Failed to sync slash commands to guild %s", gid)
-        if not synced_any_guild:
-            await self.tree.sync()
-            logging.info("Slash commands globally synced (may take up to 1 hour to appear).")
+                await self._sync_command_tree(only_if_changed=policy == "safe")
+            except discord.DiscordException:
+                logging.exception("Failed to sync slash commands on startup")
+
+    async def _command_tree_changed(self, guild: Optional[discord.abc.Snowflake] = None) -> bool:
+        scope = f"guild {guild.id}" if guild else "global"
+        application_id = self.application_id
+        if application_id is None:
+            logging.warning("Application id unknown; assuming %s slash commands need a sync.", scope)
+            return True
+        # Compare raw payloads: AppCommand.to_dict() drops default_member_permissions,
+        # dm_permission and nsfw, and AppCommand misparses the contexts array.
         try:
-            cmd_names = ", ".join(sorted(cmd.name for cmd in self.tree.get_commands()))
-            logging.info("Registered slash commands: %s", cmd_names)
-        except Exception:
-            logging.exception("Unable to list registered slash commands")
+            if guild is None:
+                remote = await self.http.get_global_commands(application_id)
+            else:
+                remote = await self.http.get_guild_commands(application_id, guild.id)
+        except discord.DiscordException:
+            logging.exception("Failed to fetch %s slash commands; assuming a sync is needed", scope)
+            return True
+        local_hash = command_tree_fingerprint([cmd.to_dict(self.tree) for cmd in self.tree.get_commands(guild=guild)])
+        remote_hash = command_tree_fingerprint(list(remote))
+        if local_hash == remote_hash:
+            logging.info("Slash commands (%s) already up to date (%s); skipping sync.", scope, local_hash)
+            return False
+        logging.info("Slash commands (%s) changed (%s -> %s); syncing.", scope, remote_hash, local_hash)
+        return True
+
+    async def _sync_guild_commands(self, guild_id: int, *, only_if_changed: bool = False) -> Optional[str]:
+        try:
+            guild_obj = discord.Object(id=guild_id)
+            self.tree.copy_global_to(guild=guild_obj)
+            if only_if_changed and not await self._command_tree_changed(guild_obj):
+                return f"guild {guild_id} (already up to date)"
+            await self.tree.sync(guild=guild_obj)
+        except discord.DiscordException:
+            logging.exception("Failed to sync slash commands to guild %s", guild_id)
+            return None
+        logging.info("Slash commands synced to guild %s", guild_id)
+        return f"guild {guild_id}"
+
+    async def _sync_command_tree(self, *, only_if_changed: bool = False) -> str:
+        guild_ids = self.config.command_guild_ids
+        results = await asyncio.gather(
+            *(self._sync_guild_commands(gid, only_if_changed=only_if_changed) for gid in guild_ids)
+        )
+        synced_guilds = [status for status in results if status is not None]
+        if synced_guilds:
+            return ", ".join(synced_guilds)
+        if only_if_changed and not await self._command_tree_changed():
+            return "all servers (already up to date)"
+        await self.tree.sync()
+        logging.info("Slash commands globally synced (may take up to 1 hour to appear).")
+        return "all servers (global sync may take up to 1 hour to appear)"
 
     async def on_ready(self) -> None:
         logging.info("Bot is ready: %s", self.user)
         http_base = self.config.http_credentials.base_url if self.config.http_credentials else "unset"
         logging.info("HTTP API base=%s; current VIP duration=%.2f hours", http_base, self.vip_duration_hours)
-        await self.refresh_announcement_message()
+        # Re-check the posted panel on every (re)READY so a message deleted while
+        # the bot was connected or offline gets reposted.
+        await self.refresh_announcement_message(verify=True)
 
-    async def refresh_announcement_message(self) -> None:
+    async def refresh_announcement_message(self, *, verify: bool = False) -> None:
         if not self.persistent_view:
             logging.error("Persistent view not initialised; cannot refresh announcement message.")
             return
@@ -1139,33 +1423,57 @@ class FrontlinePassBot(commands.Bot):
             self.persistent_view,
             self.vip_duration_hours,
             self.last_grant_time,
+            verify=verify,
         )
 
     def _user_has_moderator_privileges(self, user: discord.abc.User) -> bool:
-        permissions = getattr(user, "guild_permissions", None)  # type: ignore[attr-defined]
-        if permissions and permissions.administrator:
+        if not isinstance(user, discord.Member):
+            return False
+        if user.guild_permissions.administrator:
             return True
-        role_id = self.config.moderator_role_id
-        if role_id and hasattr(user, "roles"):
-            for role in getattr(user, "roles", []):  # type: ignore[assignment]
-                if getattr(role, "id", None) == role_id:
-                    return True
-        return False
+        return not self._moderator_role_ids.isdisjoint(role.id for role in user.roles)
 
     async def set_vip_duration_hours(self, hours: float) -> None:
         self._vip_duration_hours = hours
+        self._vip_duration_message = format_vip_duration_message(hours)
         if self.persistent_view:
             self.persistent_view.refresh_vip_label()
         await self.refresh_announcement_message()
 
+    async def _handle_set_vip_duration(self, interaction: discord.Interaction, hours: float) -> None:
+        if not self._user_has_moderator_privileges(interaction.user):
+            await interaction.response.send_message(
+                "You need moderator permissions to use this command.",
+                ephemeral=True,
+            )
+            schedule_ephemeral_cleanup(interaction)
+            return
+
+        if hours <= 0:
+            await interaction.response.send_message(
+                "VIP duration must be greater than zero hours.",
+                ephemeral=True,
+            )
+            schedule_ephemeral_cleanup(interaction)
+            return
+
+        # Reply before the announcement edit so the interaction is acknowledged
+        # within Discord's deadline without a separate defer round trip.
+        await interaction.response.send_message(
+            f"VIP duration updated to {hours:g} hours.",
+            ephemeral=True,
+        )
+        schedule_ephemeral_cleanup(interaction)
+        await self.set_vip_duration_hours(hours)
+
     async def _register_commands(self) -> None:
         @self.tree.command(
             name="repost_frontline_controls",
             description="Repost the Frontline VIP control panel.",
         )
         async def repost_frontline_controls(interaction: discord.Interaction) -> None:
-            permissions = getattr(interaction.user, "guild_permissions", None)  # type: ignore[attr-defined]
-            if not permissions or not permissions.administrator:
+            user = interaction.user
+            if not isinstance(user, discord.Member) or not user.guild_permissions.administrator:
                 await interaction.response.send_message(
                     "You need administrator permissions to use this command.",
                     ephemeral=True,
@@ -1206,66 +1514,72 @@ class FrontlinePassBot(commands.Bot):
                 schedule_ephemeral_cleanup(interaction, message=followup_message)
 
         @self.tree.command(
-            name="set_vip_duration",
-            description="Set the VIP duration in hours.",
+            name="sync_commands",
+            description="Push the bot's slash commands to Discord.",
         )
-        @app_commands.describe(hours="Number of hours that VIP access should last")
-        async def set_vip_duration(interaction: discord.Interaction, hours: float) -> None:
-            if not self._user_has_moderator_privileges(interaction.user):
+        @app_commands.describe(
+            guild_id="Optional server ID to sync instead of the configured targets",
+            force="Push even if Discord already has the current commands",
+        )
+        async def sync_commands(
+            interaction: discord.Interaction,
+            guild_id: Optional[str] = None,
+            force: bool = False,
+        ) -> None:
+            user = interaction.user
+            if not isinstance(user, discord.Member) or not user.guild_permissions.administrator:
                 await interaction.response.send_message(
-                    "You need moderator permissions to use this command.",
+                    "You need administrator permissions to use this command.",
                     ephemeral=True,
                 )
                 schedule_ephemeral_cleanup(interaction)
                 return
 
-            if hours <= 0:
-                await interaction.response.send_message(
-                    "VIP duration must be greater than zero hours.",
-                    ephemeral=True,
-                )
-                schedule_ephemeral_cleanup(interaction)
-                return
+            target_guild_id: Optional[int] = None
+            if guild_id:
+                try:
+                    target_guild_id = int(guild_id.strip())
+                except ValueError:
+                    await interaction.response.send_message(
+                        f"{guild_id!r} is not a valid server ID.",
+                        ephemeral=True,
+                    )
+                    schedule_ephemeral_cleanup(interaction)
+                    return
 
             await interaction.response.defer(ephemeral=True)
-            await self.set_vip_duration_hours(hours)
-            followup_message = await interaction.followup.send(
-                f"VIP duration updated to {hours:g} hours.",
-                ephemeral=True,
-                wait=True,
-            )
+            if target_guild_id is not None:
+                status = await self._sync_guild_commands(target_guild_id, only_if_changed=not force)
+                if status is not None:
+                    body = f"Slash commands synced to {status}."
+                else:
+                    body = f"Failed to sync slash commands to guild {target_guild_id}. Check the bot logs for details."
+            else:
+                try:
+                    target = await self._sync_command_tree(only_if_changed=not force)
+                except discord.DiscordException:
+                    logging.exception("Failed to sync slash commands globally")
+                    body = "Failed to sync slash commands. Check the bot logs for details."
+                else:
+                    body = f"Slash commands synced to {target}."
+            followup_message = await interaction.followup.send(body, ephemeral=True, wait=True)
             schedule_ephemeral_cleanup(interaction, message=followup_message)
 
+        @self.tree.command(
+            name="set_vip_duration",
+            description="Set the VIP duration in hours.",
+        )
+        @app_commands.describe(hours="Number of hours that VIP access should last")
+        async def set_vip_duration(interaction: discord.Interaction, hours: float) -> None:
+            await self._handle_set_vip_duration(interaction, hours)
+
         @self.tree.command(
             name="setvipduration",
             description="Set the VIP duration in hours (alias).",
         )
         @app_commands.describe(hours="Number of hours that VIP access should last")
         async def setvipduration(interaction: discord.Interaction, hours: float) -> None:
-            if not self._user_has_moderator_privileges(interaction.user):
-                await interaction.response.send_message(
-                    "You need moderator permissions to use this command.",
-                    ephemeral=True,
-                )
-                schedule_ephemeral_cleanup(interaction)
-                return
-
-            if hours <= 0:
-                await interaction.response.send_message(
-                    "VIP duration must be greater than zero hours.",
-                    ephemeral=True,
-                )
-                schedule_ephemeral_cleanup(interaction)
-                return
-
-            await interaction.response.defer(ephemeral=True)
-            await self.set_vip_duration_hours(hours)
-            followup_message = await interaction.followup.send(
-                f"VIP duration updated to {hours:g} hours.",
-                ephemeral=True,
-                wait=True,
-            )
-            schedule_ephemeral_cleanup(interaction, message=followup_message)
+            await self._handle_set_vip_duration(interaction, hours)
 
         @self.tree.command(
             name="getvipduration",
@@ -1273,7 +1587,7 @@ class FrontlinePassBot(commands.Bot):
         )
         async def getvipduration(interaction: discord.Interaction) -> None:
             await interaction.response.send_message(
-                f"Current VIP duration: {self.vip_duration_hours:g} hours.",
+                self._vip_duration_message,
                 ephemeral=True,
             )
             schedule_ephemeral_cleanup(interaction)
@@ -1287,7 +1601,7 @@ class FrontlinePassBot(commands.Bot):
             await interaction.response.defer(ephemeral=True)
             now = datetime.now(timezone.utc)
             try:
-                status = self.vip_service.get_player_vip_status(player_id)
+                status = await asyncio.to_thread(self.vip_service.get_player_vip_status, player_id)
             except VipHTTPError as exc:
                 followup_message = await interaction.followup.send(
                     f"Unable to fetch VIP status for {player_id}: {exc}",
@@ -1381,7 +1695,8 @@ class FrontlinePassBot(commands.Bot):
             msg = (
                 f"VIP duration: {self.vip_duration_hours:g} hours\n"
                 f"Last VIP grant: {last_grant_text}\n"
-                f"HTTP API base: {http_base}"
+                f"HTTP API base: {http_base}\n"
+                f"Commands: {', '.join(self._registered_command_names) or 'none'}"
             )
             await interaction.response.send_message(msg, ephemeral=True)
             schedule_ephemeral_cleanup(interaction)
@@ -1437,7 +1752,7 @@ class FrontlinePassBot(commands.Bot):
                 return
 
             try:
-                await member.add_roles(role, reason="Frontline Pass: temporary VIP role for claim")
+                await member.add_roles(role, reason=ASSIGNVIP_ROLE_REASON)
             except discord.Forbidden:
                 await interaction.response.send_message(
                     "I don't have permission to assign that role. Ensure my role is above the VIP role.",
@@ -1454,8 +1769,7 @@ class FrontlinePassBot(commands.Bot):
                 schedule_ephemeral_cleanup(interaction)
                 return
 
-            claim_channel_id = self.config.vip_claim_channel_id or self.config.channel_id
-            channel_mention = f"<#{claim_channel_id}>" if claim_channel_id else "the VIP channel"
+            channel_mention = self._claim_channel_mention
             announcement = (
                 f"Assigned {role.mention} to {member.mention} by {interaction.user.mention}.\n"
                 f"Please go to {channel_mention} and press Get VIP, then enter the Player-ID when prompted.\n"
@@ -1522,7 +1836,22 @@ def main() -> None:
     config = load_config()
     vip_service = VipService(config)
     bot = create_bot(config, vip_service)
-    bot.run(config.discord_token)
+    if uvloop is None:
+        bot.run(config.discord_token)
+    elif sys.version_info < (3, 12):
+        # asyncio.run() only accepts a loop_factory from 3.12; the policy API is deprecated in 3.14.
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        bot.run(config.discord_token)
+    else:
+        # Mirror Client.run(), which cannot be handed a loop factory.
+        discord.utils.setup_logging()
+
+        async def runner() -> None:
+            async with bot:
+                await bot.start(config.discord_token)
+
+        with contextlib.suppress(KeyboardInterrupt):
+            asyncio.run(runner(), loop_factory=uvloop.new_event_loop)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,18 @@
+import importlib.util
+import pathlib
+import sys
+from types import ModuleType
+
+MODULE_PATH = pathlib.Path(__file__).resolve().parent.parent / "frontline-pass.py"
+MODULE_NAME = "frontline_pass_module"
+
+
+def load_frontline_pass() -> ModuleType:
+    """Import frontline-pass.py once and share the module across test files."""
+    module = sys.modules.get(MODULE_NAME)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(MODULE_NAME, MODULE_PATH)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[MODULE_NAME] = module
+        spec.loader.exec_module(module)  # type: ignore[union-attr]
+    return module
@@ -0,0 +1,109 @@
+import unittest
+from typing import Optional
+
+import discord
+from discord import app_commands
+
+from _loader import load_frontline_pass
+
+frontline_pass = load_frontline_pass()
+
+command_tree_fingerprint = frontline_pass.command_tree_fingerprint
+
+
+def build_tree(
+    description: str = "Show a player's VIP status.",
+    *,
+    moderator_only: bool = False,
+) -> app_commands.CommandTree:
+    client = discord.Client(intents=discord.Intents.none())
+    tree = app_commands.CommandTree(client)
+
+    @tree.command(name="show_player_vip", description=description)
+    @app_commands.describe(player_id="Player ID string")
+    async def show_player_vip(interaction: discord.Interaction, player_id: str) -> None:
+        pass
+
+    if moderator_only:
+        app_commands.default_permissions(manage_guild=True)(show_player_vip)
+        app_commands.guild_only()(show_player_vip)
+
+    @tree.command(name="vipassignlimit", description="View or update the weekly limit.")
+    @app_commands.describe(limit="Optional new weekly limit")
+    async def vipassignlimit(interaction: discord.Interaction, limit: Optional[int] = None) -> None:
+        pass
+
+    return tree
+
+
+def remote_payloads():
+    return [
+        {
+            "id": "2",
+            "application_id": "99",
+            "version": "5",
+            "type": 1,
+            "name": "vipassignlimit",
+            "description": "View or update the weekly limit.",
+            "default_member_permissions": None,
+            "dm_permission": True,
+            "nsfw": False,
+            "contexts": None,
+            "integration_types": [0],
+            "options": [
+                {"type": 4, "name": "limit", "description": "Optional new weekly limit"},
+            ],
+        },
+        {
+            "id": "1",
+            "application_id": "99",
+            "version": "5",
+            "type": 1,
+            "name": "show_player_vip",
+            "description": "Show a player's VIP status.",
+            "default_member_permissions": None,
+            "dm_permission": True,
+            "nsfw": False,
+            "contexts": None,
+            "integration_types": [0],
+            "options": [
+                {"type": 3, "name": "player_id", "description": "Player ID string", "required": True},
+            ],
+        },
+    ]
+
+
+def local_payloads(tree: app_commands.CommandTree):
+    return [cmd.to_dict(tree) for cmd in tree.get_commands()]
+
+
+class CommandTreeFingerprintTests(unittest.TestCase):
+    def test_local_tree_matches_remote_commands(self) -> None:
+        tree = build_tree()
+
+        self.assertEqual(command_tree_fingerprint(local_payloads(tree)), command_tree_fingerprint(remote_payloads()))
+
+    def test_changed_description_alters_fingerprint(self) -> None:
+        tree = build_tree(description="Updated description.")
+
+        self.assertNotEqual(
+            command_tree_fingerprint(local_payloads(tree)), command_tree_fingerprint(remote_payloads())
+        )
+
+    def test_changed_permissions_alter_fingerprint(self) -> None:
+        tree = build_tree(moderator_only=True)
+
+        self.assertNotEqual(
+            command_tree_fingerprint(local_payloads(tree)), command_tree_fingerprint(remote_payloads())
+        )
+
+    def test_matching_permissions_compare_equal(self) -> None:
+        tree = build_tree(moderator_only=True)
+        remote = remote_payloads()
+        remote[1].update(default_member_permissions="32", dm_permission=False, contexts=[0])
+
+        self.assertEqual(command_tree_fingerprint(local_payloads(tree)), command_tree_fingerprint(remote))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import unittest
+from unittest import mock
+
+from _loader import load_frontline_pass
+
+frontline_pass = load_frontline_pass()
+
+BASE_ENV = {
+    "DISCORD_TOKEN": "token",
+    "VIP_DURATION_HOURS": "4",
+    "CHANNEL_ID": "123",
+    "LOCAL_TIMEZONE": "UTC",
+    "CRCON_HTTP_BASE_URL": "https://crcon.example.com",
+    "CRCON_HTTP_BEARER_TOKEN": "abc123",
+}
+
+
+class LoadConfigTests(unittest.TestCase):
+    def load(self, raw_config=None, **env):
+        environ = dict(BASE_ENV, **env)
+        with mock.patch.dict(os.environ, environ, clear=True), mock.patch.object(
+            frontline_pass, "load_dotenv"
+        ), mock.patch.object(frontline_pass, "_load_raw_config", return_value=(raw_config or {}, None)):
+            return frontline_pass.load_config()
+
+    def test_command_guild_ids_parsed_from_env(self) -> None:
+        config = self.load(COMMAND_GUILD_IDS="111, 222,")
+
+        self.assertEqual(config.command_guild_ids, (111, 222))
+
+    def test_single_command_guild_id_from_config_file(self) -> None:
+        config = self.load({"COMMAND_GUILD_ID": 333})
+
+        self.assertEqual(config.command_guild_ids, (333,))
+
+    def test_invalid_command_guild_ids_fall_back_to_global(self) -> None:
+        config = self.load(COMMAND_GUILD_IDS="abc")
+
+        self.assertEqual(config.command_guild_ids, ())
+
+    def test_timezone_name_matched_case_insensitively(self) -> None:
+        config = self.load(LOCAL_TIMEZONE="australia/sydney")
+
+        self.assertEqual(config.timezone_name, "Australia/Sydney")
+        self.assertEqual(str(config.timezone), "Australia/Sydney")
+
+    def test_invalid_timezone_reports_config_error(self) -> None:
+        with self.assertRaisesRegex(RuntimeError, "LOCAL_TIMEZONE must be a valid IANA timezone"):
+            self.load(LOCAL_TIMEZONE="Nope/Zone")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from _loader import load_frontline_pass
+
+frontline_pass = load_frontline_pass()
+
+EphemeralCleanupScheduler = frontline_pass.EphemeralCleanupScheduler
+
+
+def make_interaction(deleted, name, *, error=None):
+    interaction = mock.Mock()
+
+    async def delete_original_response():
+        if error is not None:
+            raise error
+        deleted.append(name)
+
+    interaction.delete_original_response = delete_original_response
+    return interaction
+
+
+class EphemeralCleanupSchedulerTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.scheduler = EphemeralCleanupScheduler()
+        self.deleted = []
+
+    async def asyncTearDown(self) -> None:
+        task = self.scheduler._task
+        if task is not None and not task.done():
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+    async def test_deletes_in_deadline_order(self) -> None:
+        self.scheduler.enqueue(make_interaction(self.deleted, "late"), None, 0.05)
+        self.scheduler.enqueue(make_interaction(self.deleted, "early"), None, 0.01)
+
+        await asyncio.sleep(0.1)
+
+        self.assertEqual(self.deleted, ["early", "late"])
+
+    async def test_earlier_deadline_wakes_the_loop(self) -> None:
+        self.scheduler.enqueue(make_interaction(self.deleted, "slow"), None, 10.0)
+        await asyncio.sleep(0)
+        self.scheduler.enqueue(make_interaction(self.deleted, "fast"), None, 0.01)
+
+        await asyncio.sleep(0.1)
+
+        self.assertEqual(self.deleted, ["fast"])
+
+    async def test_failed_delete_does_not_stop_later_cleanups(self) -> None:
+        failing = make_interaction(self.deleted, "broken", error=OSError("connection reset"))
+        self.scheduler.enqueue(failing, None, 0.01)
+        self.scheduler.enqueue(make_interaction(self.deleted, "same-batch"), None, 0.01)
+        self.scheduler.enqueue(make_interaction(self.deleted, "later"), None, 0.05)
+
+        with self.assertLogs(level="ERROR"):
+            await asyncio.sleep(0.1)
+
+        self.assertEqual(self.deleted, ["same-batch", "later"])
+        self.assertTrue(self.scheduler._task.done())
+        self.assertIsNone(self.scheduler._task.exception())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,19 +1,13 @@
-import importlib.util
-import pathlib
 import unittest
 from datetime import datetime, timedelta, timezone
 from unittest import mock
+from zoneinfo import ZoneInfo
 
-import pytz
 from requests.cookies import RequestsCookieJar
 
-MODULE_PATH = pathlib.Path(__file__).resolve().parent.parent / "frontline-pass.py"
-SPEC = importlib.util.spec_from_file_location("frontline_pass_module", MODULE_PATH)
-frontline_pass = importlib.util.module_from_spec(SPEC)
-import sys
+from _loader import load_frontline_pass
 
-sys.modules[SPEC.name] = frontline_pass
-SPEC.loader.exec_module(frontline_pass)  # type: ignore[union-attr]
+frontline_pass = load_frontline_pass()
 
 AppConfig = frontline_pass.AppConfig
 HttpCredentials = frontline_pass.HttpCredentials
@@ -34,6 +28,7 @@ class DummyResponse:
         self.status_code = status_code
         self._payload = payload
         self.text = text if text is not None else "response-text"
+        self.content = self.text.encode("utf-8")
         self.cookies = cookies or RequestsCookieJar()
 
     def json(self) -> dict:
@@ -134,6 +129,18 @@ class VipHttpClientTests(unittest.TestCase):
         with self.assertRaises(VipHTTPError):
             client.add_vip("player-id", "desc", None)
 
+    def test_error_message_truncates_large_body(self) -> None:
+        session = DummySession(DummyResponse(502, {}, text="x" * 5000))
+        client = VipHttpClient(
+            HttpCredentials(base_url="https://example/api", bearer_token="abc123"),
+            session=session,
+        )
+
+        with self.assertRaises(VipHTTPError) as ctx:
+            client.add_vip("player-id", "desc", None)
+
+        self.assertEqual(str(ctx.exception), "add_vip failed with status 502: " + "x" * 512)
+
     def test_bearer_token_preferred_over_login(self) -> None:
         session = DummySession(DummyResponse(200, {"result": "ok"}))
         credentials = HttpCredentials(
@@ -149,6 +156,41 @@ class VipHttpClientTests(unittest.TestCase):
         self.assertEqual(len(session.calls), 1)
         self.assertNotIn("login", session.calls[0]["url"])
 
+    def test_rejected_bearer_token_falls_back_to_login(self) -> None:
+        login_response = DummyResponse(200, {"result": {"token": "fresh-token"}})
+        session = DummySession(
+            [
+                DummyResponse(401, {"error": "unauthorized"}),
+                login_response,
+                DummyResponse(200, {"result": "ok"}),
+                DummyResponse(200, {"result": "ok"}),
+            ]
+        )
+        credentials = HttpCredentials(
+            base_url="https://example",
+            bearer_token="stale-token",
+            username="user",
+            password="pass",
+        )
+        client = VipHttpClient(credentials, session=session)
+
+        client.add_vip("player-id", "desc", None)
+        client.add_vip("player-id", "desc", None)
+
+        urls = [call["url"] for call in session.calls]
+        self.assertEqual(
+            urls,
+            [
+                "https://example/api/add_vip",
+                "https://example/api/login",
+                "https://example/api/add_vip",
+                "https://example/api/add_vip",
+            ],
+        )
+        self.assertEqual(session.calls[0]["headers"]["Authorization"], "Bearer stale-token")
+        self.assertEqual(session.calls[2]["headers"]["Authorization"], "Bearer fresh-token")
+        self.assertEqual(session.calls[3]["headers"]["Authorization"], "Bearer fresh-token")
+
     def test_logs_in_and_uses_session_cookie(self) -> None:
         cookie_jar = RequestsCookieJar()
         cookie_jar.set("sessionid", "session-cookie")
@@ -175,6 +217,31 @@ class VipHttpClientTests(unittest.TestCase):
         self.assertEqual(session.calls[0]["url"], "https://example/api/login")
         self.assertEqual(session.calls[1]["url"], "https://example/api/add_vip")
         self.assertEqual(session.calls[1]["headers"]["Referer"], "https://example")
+        self.assertEqual(session.calls[1]["headers"]["X-CSRFToken"], "csrf-token")
+
+    def test_uses_rotated_csrf_cookie(self) -> None:
+        cookie_jar = RequestsCookieJar()
+        cookie_jar.set("sessionid", "session-cookie")
+        cookie_jar.set("csrftoken", "csrf-token")
+        rotated_jar = RequestsCookieJar()
+        rotated_jar.set("csrftoken", "rotated-token")
+        session = DummySession(
+            [
+                DummyResponse(200, {"result": True, "failed": False}, cookies=cookie_jar),
+                DummyResponse(200, {"result": "ok"}, cookies=rotated_jar),
+                DummyResponse(200, {"result": "ok"}),
+            ]
+        )
+        client = VipHttpClient(
+            HttpCredentials(base_url="https://example", username="user", password="pass"),
+            session=session,
+        )
+
+        client.add_vip("player-id", "desc", None)
+        client.add_vip("player-id", "desc", None)
+
+        self.assertEqual(session.calls[1]["headers"]["X-CSRFToken"], "csrf-token")
+        self.assertEqual(session.calls[2]["headers"]["X-CSRFToken"], "rotated-token")
 
     def test_get_player_profile_fetches_profile(self) -> None:
         session = DummySession(DummyResponse(200, {"result": {"player_id": "player-id"}}))
@@ -215,7 +282,7 @@ class VipServiceTests(unittest.TestCase):
             discord_token="token",
             vip_duration_hours=4,
             channel_id=1,
-            timezone=pytz.UTC,
+            timezone=ZoneInfo("UTC"),
             timezone_name="UTC",
             http_credentials=HttpCredentials(
                 base_url="https://example",
@@ -235,7 +302,7 @@ class VipServiceTests(unittest.TestCase):
         result = service.grant_vip(
             "steam123",
             duration_hours=4,
-            local_timezone=pytz.UTC,
+            local_timezone=ZoneInfo("UTC"),
             requester_display_name="GBONE",
         )
 
@@ -262,7 +329,7 @@ class VipServiceTests(unittest.TestCase):
         service.grant_vip(
             "steam123",
             duration_hours=1,
-            local_timezone=pytz.UTC,
+            local_timezone=ZoneInfo("UTC"),
             requester_display_name="GBONE",
             player_name="GBONE001",
         )
@@ -283,7 +350,7 @@ class VipServiceTests(unittest.TestCase):
         fake_http_client.add_vip.return_value = {"result": "ok"}
         service._http_client = fake_http_client  # type: ignore[attr-defined]
         service._now_utc = mock.Mock(return_value=datetime(2030, 6, 1, tzinfo=timezone.utc))  # type: ignore[attr-defined]
-        local_tz = pytz.timezone("Australia/Sydney")
+        local_tz = ZoneInfo("Australia/Sydney")
 
         result = service.grant_vip(
             "steam123",